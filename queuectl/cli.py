@@ -1,9 +1,47 @@
 # queuectl/cli.py
 import click
+import itertools
 import json
 from queuectl.database import initialize_database
 from queuectl import queue_service, worker_logic, settings
 
+# Job listings are serialized a chunk at a time and each chunk is written to
+# stdout in one go; click.echo sends orjson's bytes straight to the binary stream.
+try:
+    import orjson
+
+    def _dump_jobs(jobs):
+        return orjson.dumps(jobs, option=orjson.OPT_INDENT_2)
+    _ARRAY_SEP = b",\n"
+except ImportError:
+    def _dump_jobs(jobs):
+        return json.dumps(jobs, indent=2)
+    _ARRAY_SEP = ",\n"
+
+LIST_CHUNK_SIZE = 500
+
+def _echo_jobs(jobs):
+    """
+    Writes an iterable of jobs to stdout as a single JSON array.
+    Jobs are pulled and serialized LIST_CHUNK_SIZE at a time, so the full
+    result set is never held in memory.
+    """
+    chunk = [job for job in itertools.islice(jobs, LIST_CHUNK_SIZE)]
+    if not chunk:
+        click.echo(_dump_jobs(chunk))
+        return
+
+    # Each chunk dumps as "[\n  {...},\n  {...}\n]"; splicing the bodies
+    # together gives exactly the output of dumping the whole list at once.
+    out = _dump_jobs(chunk)
+    click.echo(out[:-2], nl=False)
+    while True:
+        chunk = [job for job in itertools.islice(jobs, LIST_CHUNK_SIZE)]
+        if not chunk:
+            break
+        click.echo(_ARRAY_SEP + _dump_jobs(chunk)[2:-2], nl=False)
+    click.echo(out[-2:])
+
 @click.group()
 def cli():
     """
@@ -27,6 +65,18 @@ def enqueue(job_spec_json):
     """
     queue_service.add_job(job_spec_json)
 
+@cli.command(name="enqueue-batch")
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+def enqueue_batch(path):
+    """
+    Add many jobs from a JSON file in a single transaction.
+    
+    The file must contain a JSON array of job specs, e.g.:
+    [{"id":"job1","command":"echo one"}, {"command":"echo two"}]
+    """
+    with open(path, 'rb') as f:
+        queue_service.add_jobs(f.read())
+
 @cli.group()
 def worker():
     """Manage worker processes."""
@@ -58,7 +108,11 @@ def status():
 @click.option('--state', 
               type=click.Choice(['pending', 'processing', 'completed', 'dead'], case_sensitive=False),
               help='Filter jobs by state.')
-def list(state):
+@click.option('--limit', type=click.IntRange(min=0), default=None,
+              help='Maximum number of jobs to show per state.')
+@click.option('--offset', type=click.IntRange(min=0), default=0,
+              help='Number of jobs to skip per state.')
+def list(state, limit, offset):
     """List jobs, optionally filtering by state."""
     if not state:
         click.echo("Listing all jobs (use --state to filter):")
@@ -66,12 +120,20 @@ def list(state):
     else:
         states_to_list = [state]
     
+    counts = queue_service.count_jobs_by_state()
     for s in states_to_list:
-        jobs = queue_service.find_jobs_by_state(s)
-        if jobs:
-            click.echo(f"\n--- State: {s.upper()} ({len(jobs)}) ---")
-            for job in jobs:
-                click.echo(json.dumps(job, indent=2))
+        total = counts.get(s, 0)
+        shown = max(0, total - offset)
+        if limit is not None:
+            shown = min(shown, limit)
+        if shown == 0:
+            continue
+
+        if shown == total:
+            click.echo(f"\n--- State: {s.upper()} ({total}) ---")
+        else:
+            click.echo(f"\n--- State: {s.upper()} (showing {shown} of {total}) ---")
+        _echo_jobs(queue_service.find_jobs_by_state(s, limit=limit, offset=offset))
 
 @cli.group()
 def dlq():
@@ -81,14 +143,13 @@ def dlq():
 @dlq.command(name="list")
 def dlq_list():
     """View all jobs in the DLQ."""
-    jobs = queue_service.show_dlq_jobs()
-    if not jobs:
+    count = queue_service.count_jobs_by_state().get('dead', 0)
+    if count == 0:
         click.echo("Dead Letter Queue is empty.")
         return
         
-    click.echo(f"--- DLQ Jobs ({len(jobs)}) ---")
-    for job in jobs:
-        click.echo(json.dumps(job, indent=2))
+    click.echo(f"--- DLQ Jobs ({count}) ---")
+    _echo_jobs(queue_service.show_dlq_jobs())
 
 @dlq.command(name="retry")
 @click.argument('job_id', type=str)
@@ -1,21 +1,75 @@
 # queuectl/database.py
 import sqlite3
 import os
+import threading
 from pathlib import Path
 
 DB_DIR = Path.home() / ".queuectl"
 DB_PATH = DB_DIR / "queue.db"
 
+# One connection per process and thread, keyed by PID so a forked worker never
+# reuses its parent's handle and by thread because sqlite3 connections are
+# bound to the thread that opened them.
+_conn_cache = {}
+
+BUSY_TIMEOUT_MS = 30000
+
+# Also run by workers_registry when a worker registers, so a database created
+# before the workers table existed keeps working without a fresh init-db.
+WORKERS_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS workers (
+    pid INTEGER PRIMARY KEY,
+    worker_id INTEGER NOT NULL,
+    started_at TEXT NOT NULL,
+    last_heartbeat TEXT NOT NULL
+);
+"""
+
 def get_db_connection():
-    """Establishes a connection to the SQLite database."""
+    """
+    Returns this process's SQLite connection, opening it on first use.
+    Using the connection as a context manager wraps a transaction; it never closes it.
+    """
+    key = (os.getpid(), threading.get_ident())
+    conn = _conn_cache.get(key)
+    if conn is not None:
+        return conn
+
     DB_DIR.mkdir(parents=True, exist_ok=True)
     
-    conn = sqlite3.connect(DB_PATH, timeout=10)
+    # The connection lives for the whole process, so give the statement
+    # cache room for every query the workers and CLI repeat.
+    conn = sqlite3.connect(DB_PATH, cached_statements=256)
     conn.row_factory = sqlite3.Row
     
     conn.execute("PRAGMA journal_mode=WAL;")
+    # NORMAL is durable under WAL and skips the fsync on every commit.
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    # Wait for competing writers instead of failing with "database is locked".
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS};")
+    # Every job costs several small commits; checkpoint less often so fewer of
+    # them stall on one, and cap the WAL file left on disk after a burst.
+    conn.execute("PRAGMA wal_autocheckpoint=10000;")
+    conn.execute("PRAGMA journal_size_limit=67108864;")
+    _conn_cache[key] = conn
     return conn
 
+def checkpoint_wal():
+    """
+    Copies the WAL back into the database and truncates it, without waiting
+    on other connections. Returns False if another connection was busy and
+    the checkpoint was left incomplete.
+    """
+    conn = get_db_connection()
+    # A TRUNCATE checkpoint otherwise sits in the busy handler for the full
+    # timeout whenever any other worker has a read open.
+    conn.execute("PRAGMA busy_timeout=0;")
+    try:
+        busy, _, _ = conn.execute("PRAGMA wal_checkpoint(TRUNCATE);").fetchone()
+    finally:
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS};")
+    return not busy
+
 def initialize_database():
     """Creates the necessary tables if they don't exist."""
     with get_db_connection() as conn:
@@ -34,11 +88,17 @@ def initialize_database():
         );
         """)
         
+        # Matches claim_next_job: equality on state, then created_at order, with
+        # next_run_at alongside so the backoff filter never touches the table.
+        # Listing and counting by state use the same index.
+        cursor.execute("DROP INDEX IF EXISTS idx_jobs_pending_next_run;")
         cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_jobs_pending_next_run
-        ON jobs (state, next_run_at);
+        CREATE INDEX IF NOT EXISTS idx_jobs_state_created
+        ON jobs (state, created_at, next_run_at);
         """)
 
+        cursor.execute(WORKERS_SCHEMA_SQL)
+
         cursor.execute("""
         CREATE TABLE IF NOT EXISTS config (
             key TEXT PRIMARY KEY,
@@ -50,4 +110,5 @@ def initialize_database():
         cursor.execute("INSERT OR IGNORE INTO config (key, value) VALUES ('backoff_base_seconds', '2')")
         
         conn.commit()
+        cursor.execute("ANALYZE;")
     print(f"Database initialized at: {DB_PATH}")
\ No newline at end of file
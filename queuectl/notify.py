@@ -0,0 +1,75 @@
+# queuectl/notify.py
+import os
+import select
+import socket
+import time
+from pathlib import Path
+
+NOTIFY_DIR = Path.home() / ".queuectl" / "notify"
+
+def open_listener():
+    """
+    Binds a datagram socket that wakes this worker when new jobs arrive.
+    Returns None where Unix sockets are unavailable; waiting then falls back to sleeping.
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+
+    NOTIFY_DIR.mkdir(parents=True, exist_ok=True)
+    path = NOTIFY_DIR / f"worker.{os.getpid()}.sock"
+    # A crashed worker with a recycled PID may have left its socket behind.
+    path.unlink(missing_ok=True)
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    sock.bind(str(path))
+    sock.setblocking(False)
+    return sock
+
+def close_listener(sock):
+    """Closes a listener and removes its socket file."""
+    if sock is None:
+        return
+    path = sock.getsockname()
+    sock.close()
+    Path(path).unlink(missing_ok=True)
+
+def wait_for_jobs(sock, timeout):
+    """Blocks until a notification arrives or `timeout` seconds pass."""
+    if sock is None:
+        time.sleep(timeout)
+        return
+
+    readable, _, _ = select.select([sock], [], [], timeout)
+    if readable:
+        # Several enqueues may have landed while we were busy; one wake-up covers them all.
+        try:
+            while True:
+                sock.recv(16)
+        except BlockingIOError:
+            pass
+
+def wake(sock):
+    """Wakes the given listener from within its own process (e.g. from a signal handler)."""
+    if sock is None:
+        return
+    try:
+        sock.sendto(b"\0", sock.getsockname())
+    except OSError:
+        pass
+
+def notify_workers():
+    """Wakes every idle worker so new jobs are picked up without waiting for a poll."""
+    if not hasattr(socket, 'AF_UNIX') or not NOTIFY_DIR.exists():
+        return
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+        sock.setblocking(False)
+        for path in NOTIFY_DIR.glob("worker.*.sock"):
+            try:
+                sock.sendto(b"\0", str(path))
+            except (ConnectionRefusedError, FileNotFoundError):
+                # The worker died without cleaning up after itself.
+                path.unlink(missing_ok=True)
+            except OSError:
+                # Its queue is full, so it already has a wake-up pending.
+                pass
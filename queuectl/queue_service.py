@@ -1,32 +1,58 @@
 # queuectl/queue_service.py
-import json
 import sqlite3
 import uuid
 from datetime import datetime, timezone
+from typing import List, Optional
+import msgspec
 from queuectl.database import get_db_connection
 from queuectl.settings import get_setting
+from queuectl.notify import notify_workers
+from queuectl.workers_registry import get_active_worker_pids
 
-def add_job(job_spec_json):
-    """
-    Adds a new job to the queue.
-    """
+class JobSpec(msgspec.Struct):
+    """The job spec accepted by 'enqueue'; decoding parses and validates it in one pass."""
+    command: str
+    id: Optional[str] = None
+    max_retries: Optional[int] = None
+
+_decode_job_spec = msgspec.json.Decoder(JobSpec).decode
+_decode_job_specs = msgspec.json.Decoder(List[JobSpec]).decode
+
+def _spec_to_details(spec):
+    """Keeps only the fields the spec actually set, so _build_job's defaults apply."""
+    return {k: v for k, v in msgspec.structs.asdict(spec).items() if v is not None}
+
+def _parse_job_spec(job_spec_json):
+    """Parses a single job spec into a dict, or prints the problem and returns None."""
     try:
-        job_details = json.loads(job_spec_json)
-    except json.JSONDecodeError:
+        return _spec_to_details(_decode_job_spec(job_spec_json))
+    except msgspec.ValidationError as e:
+        print(f"Error: Invalid job spec: {e}.")
+        return None
+    except msgspec.DecodeError:
         print(f"Error: Invalid JSON provided.")
         return None
 
-    if 'command' not in job_details:
-        print("Error: Job must contain a 'command' field.")
+def _parse_job_specs(jobs_spec_json):
+    """Parses a JSON array of job specs into dicts, or prints the problem and returns None."""
+    try:
+        return [_spec_to_details(spec) for spec in _decode_job_specs(jobs_spec_json)]
+    except msgspec.ValidationError as e:
+        print(f"Error: Invalid job spec: {e}.")
+        return None
+    except msgspec.DecodeError:
+        print(f"Error: Invalid JSON provided.")
         return None
 
-    job_id = job_details.get('id', str(uuid.uuid4()))
-    default_retries = get_setting('max_retries', 3)
-    
-    now = datetime.now(timezone.utc).isoformat()
-    
-    job_to_insert = {
-        "id": job_id,
+_INSERT_JOB_SQL = """
+    INSERT INTO jobs (id, command, state, attempts, retry_limit, created_at, updated_at)
+    VALUES (:id, :command, :state, :attempts, :retry_limit, :created_at, :updated_at)
+"""
+
+def _build_job(job_details, default_retries, now):
+    """Turns a parsed job spec into the row inserted into the jobs table."""
+    return {
+        "id": job_details.get('id', str(uuid.uuid4())),
         "command": job_details['command'],
         "state": "pending",
         "attempts": 0,
@@ -36,16 +62,26 @@ def add_job(job_spec_json):
         "next_run_at": None
     }
 
+def add_job(job_spec_json):
+    """
+    Adds a new job to the queue.
+    """
+    job_details = _parse_job_spec(job_spec_json)
+    if job_details is None:
+        return None
+
+    default_retries = get_setting('max_retries', 3)
+    
+    now = datetime.now(timezone.utc).isoformat()
+    
+    job_to_insert = _build_job(job_details, default_retries, now)
+    job_id = job_to_insert['id']
+
     try:
         with get_db_connection() as conn:
-            conn.execute(
-                """
-                INSERT INTO jobs (id, command, state, attempts, retry_limit, created_at, updated_at)
-                VALUES (:id, :command, :state, :attempts, :retry_limit, :created_at, :updated_at)
-                """,
-                job_to_insert
-            )
+            conn.execute(_INSERT_JOB_SQL, job_to_insert)
             conn.commit()
+        notify_workers()
         print(f"Job enqueued with ID: {job_id}")
         return job_id
     except sqlite3.IntegrityError:
@@ -55,24 +91,62 @@ def add_job(job_spec_json):
         print(f"An unexpected error occurred: {e}")
         return None
 
+def add_jobs(jobs_spec_json):
+    """
+    Adds many jobs to the queue from a JSON array of job specs.
+    All jobs are inserted in a single transaction: either the whole batch
+    is enqueued or none of it is.
+    """
+    specs = _parse_job_specs(jobs_spec_json)
+    if specs is None:
+        return None
+
+    default_retries = get_setting('max_retries', 3)
+    
+    now = datetime.now(timezone.utc).isoformat()
+    
+    jobs_to_insert = [_build_job(job_details, default_retries, now) for job_details in specs]
+
+    try:
+        with get_db_connection() as conn:
+            conn.executemany(_INSERT_JOB_SQL, jobs_to_insert)
+        notify_workers()
+        print(f"Enqueued {len(jobs_to_insert)} job(s).")
+        return [job['id'] for job in jobs_to_insert]
+    except sqlite3.IntegrityError:
+        print("Error: Batch contains a job ID that already exists. No jobs were enqueued.")
+        return None
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        return None
+
 def get_queue_summary():
     """Returns a summary of job states and active workers."""
-    summary = {}
-    with get_db_connection() as conn:
-        rows = conn.execute("SELECT state, COUNT(*) as count FROM jobs GROUP BY state")
-        summary = {row['state']: row['count'] for row in rows}
+    summary = count_jobs_by_state()
 
-    from queuectl.worker_logic import get_active_worker_pids
     worker_pids = get_active_worker_pids()
     summary['active_workers'] = len(worker_pids)
     
     return summary
 
-def find_jobs_by_state(state):
-    """Returns a list of jobs matching a specific state."""
+def find_jobs_by_state(state, limit=None, offset=0):
+    """
+    Yields jobs matching a specific state, oldest first.
+    Rows are streamed from the cursor rather than collected into a list.
+    """
+    with get_db_connection() as conn:
+        rows = conn.execute(
+            "SELECT * FROM jobs WHERE state = ? ORDER BY created_at ASC LIMIT ? OFFSET ?",
+            (state, -1 if limit is None else limit, offset)
+        )
+        for row in rows:
+            yield dict(row)
+
+def count_jobs_by_state():
+    """Returns a dict mapping each state that has jobs to its job count."""
     with get_db_connection() as conn:
-        rows = conn.execute("SELECT * FROM jobs WHERE state = ? ORDER BY created_at ASC", (state,))
-        return [dict(row) for row in rows]
+        rows = conn.execute("SELECT state, COUNT(*) as count FROM jobs GROUP BY state")
+        return {row['state']: row['count'] for row in rows}
 
 def show_dlq_jobs():
     """Convenience function to list 'dead' jobs."""
@@ -96,5 +170,6 @@ def resurrect_dlq_job(job_id):
             print(f"Error: Job ID '{job_id}' not found in DLQ.")
             return False
         else:
+            notify_workers()
             print(f"Job '{job_id}' moved from DLQ to 'pending' queue.")
             return True
\ No newline at end of file
@@ -1,6 +1,15 @@
 # queuectl/settings.py
+import time
 from queuectl.database import get_db_connection
 
+_GET_SETTING_SQL = "SELECT value FROM config WHERE key = ?"
+
+# Settings only change through 'config set', so workers keep them in memory
+# for a few seconds instead of querying SQLite on every enqueue or failure.
+SETTINGS_CACHE_TTL_SECONDS = 5.0
+_cache = {}  # key -> (fetched_at, value)
+_MISSING = object()
+
 def update_setting(key, value):
     """Updates or inserts a configuration setting."""
     with get_db_connection() as conn:
@@ -9,15 +18,30 @@ def update_setting(key, value):
             (key, str(value))
         )
         conn.commit()
+    _cache.clear()
     return True
 
 def get_setting(key, default=None):
-    """Retrieves a configuration setting."""
+    """
+    Retrieves a configuration setting.
+    Values are cached per process for SETTINGS_CACHE_TTL_SECONDS, so a change
+    made from another process can take that long to be seen.
+    """
+    now = time.monotonic()
+    cached = _cache.get(key)
+    if cached is not None and now - cached[0] < SETTINGS_CACHE_TTL_SECONDS:
+        value = cached[1]
+    else:
+        value = _load_setting(key)
+        _cache[key] = (now, value)
+    return default if value is _MISSING else value
+
+def _load_setting(key):
     with get_db_connection() as conn:
-        row = conn.execute("SELECT value FROM config WHERE key = ?", (key,)).fetchone()
+        row = conn.execute(_GET_SETTING_SQL, (key,)).fetchone()
         if row:
             try:
                 return int(row['value'])
             except ValueError:
                 return row['value']
-        return default
\ No newline at end of file
+        return _MISSING
\ No newline at end of file
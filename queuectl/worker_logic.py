@@ -1,19 +1,75 @@
 # queuectl/worker_logic.py
 import subprocess
-import sqlite3
 import time
 import os
 import signal
+import sqlite3
+import threading
 import multiprocessing
 from datetime import datetime, timedelta, timezone
-from pathlib import Path
-from queuectl.database import get_db_connection
+from functools import lru_cache
+from queuectl.database import checkpoint_wal, get_db_connection
 from queuectl.settings import get_setting
+from queuectl import notify
+from queuectl.workers_registry import (
+    get_active_worker_pids,
+    heartbeat_loop,
+    register_worker,
+    unregister_worker,
+)
+
+_UTC = timezone.utc
+
+# Idle workers are woken by enqueue notifications; polling is only the fallback
+# for anything that arrives without one, and backs off while the queue stays empty.
+POLL_INTERVAL_SECONDS = 5
+MAX_POLL_INTERVAL_SECONDS = 30
+
+# Hot-path statements live at module level so every call passes the same
+# SQL text and hits the connection's prepared-statement cache.
+_CLAIM_SQL = """
+    UPDATE jobs
+    SET state = 'processing', updated_at = ?
+    WHERE id = (
+        SELECT id FROM jobs
+        WHERE state = 'pending' AND (next_run_at IS NULL OR next_run_at <= ?)
+        ORDER BY created_at ASC
+        LIMIT 1
+    )
+    RETURNING *
+"""
+
+# RETURNING needs SQLite 3.35+. Older libraries read the candidate row first
+# and claim it with an UPDATE guarded on state, keeping the row already read.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
 
-PID_DIR = Path.home() / ".queuectl" / "workers"
-POLL_INTERVAL_SECONDS = 1
+_PICK_LEGACY_SQL = """
+    SELECT * FROM jobs
+    WHERE state = 'pending' AND (next_run_at IS NULL OR next_run_at <= ?)
+    ORDER BY created_at ASC
+    LIMIT 1
+"""
+
+_MARK_PROCESSING_LEGACY_SQL = """
+    UPDATE jobs
+    SET state = 'processing', updated_at = ?
+    WHERE id = ? AND state = 'pending'
+"""
+
+_NEXT_RUN_AT_SQL = "SELECT MIN(next_run_at) FROM jobs WHERE state = 'pending'"
+
+_COMPLETE_SQL = "UPDATE jobs SET state = 'completed', updated_at = ? WHERE id = ?"
+
+_FAIL_RETRY_SQL = """
+    UPDATE jobs
+    SET state = 'pending', attempts = ?, next_run_at = ?, updated_at = ?
+    WHERE id = ?
+"""
+
+_FAIL_DEAD_SQL = "UPDATE jobs SET state = 'dead', updated_at = ? WHERE id = ?"
 
 shutdown_requested = False
+_listener = None
 
 def handle_shutdown_signal(sig, frame):
     """Sets the global flag to stop worker loops."""
@@ -21,96 +77,136 @@ def handle_shutdown_signal(sig, frame):
     if not shutdown_requested:
         print(f"Worker (PID: {os.getpid()}) received signal {sig}. Shutting down gracefully...")
         shutdown_requested = True
+        # Cut an idle wait short so the worker exits promptly.
+        notify.wake(_listener)
 
 def run_worker_instance(worker_id):
     """
     The main loop for a single worker process.
-    It continuously polls for jobs, executes them, and handles results.
+    It claims jobs until the queue is empty, then sleeps until an enqueue
+    notification, a scheduled retry, or the fallback poll interval.
     """
+    global _listener
+    _listener = notify.open_listener()
+
     signal.signal(signal.SIGINT, handle_shutdown_signal)
     signal.signal(signal.SIGTERM, handle_shutdown_signal)
 
-    PID_DIR.mkdir(parents=True, exist_ok=True)
-    pid_file_path = PID_DIR / f"worker.{os.getpid()}.pid"
-    with open(pid_file_path, 'w') as f:
-        f.write(str(worker_id))
+    started_at = register_worker(worker_id)
+    heartbeat_stop = threading.Event()
+    heartbeat = threading.Thread(
+        target=heartbeat_loop, args=(heartbeat_stop, worker_id, started_at), daemon=True
+    )
+    heartbeat.start()
     
     print(f"Worker {worker_id} started (PID: {os.getpid()})")
 
+    idle_rounds = 0
     try:
         while not shutdown_requested:
-            job = claim_next_job()
+            now = datetime.now(_UTC)
+            job = claim_next_job(now.isoformat(timespec='microseconds'))
             if job:
+                idle_rounds = 0
                 print(f"[Worker {worker_id}]: Processing job {job['id']}...")
                 process_job(job)
             else:
-                time.sleep(POLL_INTERVAL_SECONDS)
+                notify.wait_for_jobs(_listener, idle_wait_seconds(idle_rounds, now))
+                idle_rounds = min(idle_rounds + 1, 5)
     finally:
-        if pid_file_path.exists():
-            pid_file_path.unlink()
+        notify.close_listener(_listener)
+        heartbeat_stop.set()
+        heartbeat.join()
+        unregister_worker()
+        # Fold the WAL back into the database while nothing is mid-job here.
+        if not checkpoint_wal():
+            print(f"Worker {worker_id} (PID: {os.getpid()}) left the WAL in place: other connections are busy.")
         print(f"Worker {worker_id} (PID: {os.getpid()}) stopped.")
 
-def claim_next_job():
+def claim_next_job(now_iso=None):
     """
     Atomically claims the next available job from the queue.
-    This is the most critical concurrent part of the system.
+    This is the most critical concurrent part of the system: the state
+    change only applies to a job that is still pending, so two workers can
+    never claim the same job.
     """
-    now_iso = datetime.now(timezone.utc).isoformat()
+    if now_iso is None:
+        now_iso = datetime.now(_UTC).isoformat(timespec='microseconds')
     
+    if not _HAS_RETURNING:
+        return _claim_next_job_legacy(now_iso)
+
     with get_db_connection() as conn:
-        try:
-            with conn:
-                cursor = conn.execute(
-                    """
-                    SELECT id FROM jobs
-                    WHERE state = 'pending' AND (next_run_at IS NULL OR next_run_at <= ?)
-                    ORDER BY created_at ASC
-                    LIMIT 1
-                    """,
-                    (now_iso,)
-                )
-                row = cursor.fetchone()
-
-                if row is None:
-                    return None
-
-                job_id = row['id']
-                
-                conn.execute(
-                    """
-                    UPDATE jobs
-                    SET state = 'processing', updated_at = ?
-                    WHERE id = ? AND state = 'pending'
-                    """,
-                    (now_iso, job_id)
-                )
-                
-                job_row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
-                return dict(job_row)
-                
-        except sqlite3.OperationalError as e:
-            if "database is locked" in str(e):
+        row = conn.execute(_CLAIM_SQL, (now_iso, now_iso)).fetchone()
+    
+    return dict(row) if row else None
+
+def _claim_next_job_legacy(now_iso):
+    """claim_next_job for SQLite builds without UPDATE ... RETURNING."""
+    while True:
+        with get_db_connection() as conn:
+            row = conn.execute(_PICK_LEGACY_SQL, (now_iso,)).fetchone()
+            if row is None:
                 return None
-            else:
-                raise e
+
+            job = dict(row)
+            if conn.execute(_MARK_PROCESSING_LEGACY_SQL, (now_iso, job['id'])).rowcount:
+                job['state'] = 'processing'
+                job['updated_at'] = now_iso
+                return job
+        # Another worker claimed it first; try the next one.
+
+def idle_wait_seconds(idle_rounds=0, now=None):
+    """
+    How long an idle worker may sleep: the poll interval, doubled for each
+    consecutive empty poll up to MAX_POLL_INTERVAL_SECONDS, or less if a
+    backed-off job becomes due sooner (retries are not announced by enqueue).
+    """
+    interval = min(POLL_INTERVAL_SECONDS * (2 ** idle_rounds), MAX_POLL_INTERVAL_SECONDS)
+
+    with get_db_connection() as conn:
+        next_run_at = conn.execute(_NEXT_RUN_AT_SQL).fetchone()[0]
+
+    if next_run_at is None:
+        return interval
+
+    if now is None:
+        now = datetime.now(_UTC)
+    due_in = (datetime.fromisoformat(next_run_at) - now).total_seconds()
+    return min(interval, max(due_in, 0))
 
 def process_job(job):
-    """Executes the job's command and updates its state based on the result."""
+    """
+    Executes the job's command and updates its state based on the result.
+    The command's stdout is discarded; stderr is collected but only decoded
+    if the job fails.
+    """
     try:
-        result = subprocess.run(
+        # Run the job in its own session so a timeout can kill everything the
+        # shell started, not just the shell itself.
+        with subprocess.Popen(
             job['command'],
             shell=True,
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            start_new_session=True
+        ) as proc:
+            try:
+                _, stderr = proc.communicate(timeout=300)
+            except subprocess.TimeoutExpired:
+                _kill_job(proc)
+                proc.wait()
+                raise
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, job['command'], stderr=stderr)
         print(f"Job {job['id']} completed successfully.")
-        update_job_status(job['id'], 'completed')
+        now_iso = datetime.now(_UTC).isoformat(timespec='microseconds')
+        with get_db_connection() as conn:
+            conn.execute(_COMPLETE_SQL, (now_iso, job['id']))
 
     except subprocess.CalledProcessError as e:
         print(f"Job {job['id']} failed with exit code {e.returncode}.")
-        print(f"Stderr: {e.stderr}")
+        print(f"Stderr: {e.stderr.decode(errors='replace')}")
         handle_job_failure(job)
     except subprocess.TimeoutExpired:
         print(f"Job {job['id']} timed out.")
@@ -119,73 +215,79 @@ def process_job(job):
         print(f"Job {job['id']} failed with an unexpected error: {e}")
         handle_job_failure(job)
 
-def handle_job_failure(job):
-    """Handles failed jobs, increments attempts, and calculates backoff."""
+def _kill_job(proc):
+    """Kills a timed-out job's whole process group (or just the shell where groups don't exist)."""
+    try:
+        if hasattr(os, 'killpg'):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except ProcessLookupError:
+        pass
+
+@lru_cache(maxsize=64)
+def _backoff_delta(base, attempts):
+    """
+    The retry delay after `attempts` failures as (base ** attempts seconds, timedelta).
+    Only a handful of (base, attempts) pairs ever occur, so each is built once.
+    """
+    delay_seconds = base ** attempts
+    return delay_seconds, timedelta(seconds=delay_seconds)
+
+def handle_job_failure(job, now=None):
+    """
+    Handles failed jobs, increments attempts, and calculates backoff.
+    `now` is the time of the failure; updated_at and next_run_at both derive from it.
+    """
     new_attempts = job['attempts'] + 1
+    if now is None:
+        now = datetime.now(_UTC)
+    now_iso = now.isoformat(timespec='microseconds')
     
     if new_attempts >= job['retry_limit']:
         print(f"Job {job['id']} reached max retries. Moving to DLQ.")
-        update_job_status(job['id'], 'dead')
+        with get_db_connection() as conn:
+            conn.execute(_FAIL_DEAD_SQL, (now_iso, job['id']))
     else:
         backoff_base = get_setting('backoff_base_seconds', 2)
-        delay_seconds = backoff_base ** new_attempts
+        delay_seconds, delay = _backoff_delta(backoff_base, new_attempts)
         
-        next_run_time = datetime.now(timezone.utc) + timedelta(seconds=delay_seconds)
-        next_run_iso = next_run_time.isoformat()
+        next_run_time = now + delay
+        next_run_iso = next_run_time.isoformat(timespec='microseconds')
         
         print(f"Job {job['id']} failed. Retrying in {delay_seconds}s (Attempt {new_attempts}).")
-        update_job_status(
-            job['id'],
-            'pending',
-            attempts=new_attempts,
-            next_run_at=next_run_iso
-        )
-
-def update_job_status(job_id, state, attempts=None, next_run_at=None):
-    """Updates a job's state and metadata in the database."""
-    now_iso = datetime.now(timezone.utc).isoformat()
-    
-    with get_db_connection() as conn:
-        if attempts is not None:
-            conn.execute(
-                """
-                UPDATE jobs
-                SET state = ?, attempts = ?, next_run_at = ?, updated_at = ?
-                WHERE id = ?
-                """,
-                (state, attempts, next_run_at, now_iso, job_id)
-            )
-        else:
+        with get_db_connection() as conn:
             conn.execute(
-                """
-                UPDATE jobs
-                SET state = ?, updated_at = ?
-                WHERE id = ?
-                """,
-                (state, now_iso, job_id)
+                _FAIL_RETRY_SQL,
+                (new_attempts, next_run_iso, now_iso, job['id'])
             )
-        conn.commit()
 
-def get_active_worker_pids():
-    """Finds all running worker PIDs by checking the PID files."""
-    if not PID_DIR.exists():
-        return []
-    
-    pids = []
-    for pid_file in PID_DIR.glob("worker.*.pid"):
-        try:
-            pid = int(pid_file.stem.split('.')[1])
-            os.kill(pid, 0)
-            pids.append(pid)
-        except (OSError, ValueError):
-            pid_file.unlink()
-    return pids
+def _worker_context():
+    """
+    Picks the multiprocessing start method for workers.
+    Where available, a forkserver imports queuectl once and every worker is
+    forked from that warm, single-threaded process, instead of each worker
+    re-importing everything (spawn) or inheriting the CLI's state (fork).
+    """
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context()
+
+    ctx = multiprocessing.get_context('forkserver')
+    ctx.set_forkserver_preload([
+        'queuectl.database',
+        'queuectl.settings',
+        'queuectl.workers_registry',
+        'queuectl.queue_service',
+        'queuectl.worker_logic',
+    ])
+    return ctx
 
 def start_workers(count):
     """Launches the specified number of worker processes."""
+    ctx = _worker_context()
     processes = []
     for i in range(count):
-        process = multiprocessing.Process(
+        process = ctx.Process(
             target=run_worker_instance,
             args=(i + 1,),
             daemon=True
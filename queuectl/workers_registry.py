@@ -0,0 +1,71 @@
+# queuectl/workers_registry.py
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from queuectl.database import WORKERS_SCHEMA_SQL, get_db_connection
+
+_UTC = timezone.utc
+
+# Workers register themselves in the workers table and refresh last_heartbeat
+# from a background thread; a row whose heartbeat is older than the timeout
+# belongs to a worker that died without cleaning up.
+HEARTBEAT_INTERVAL_SECONDS = 3
+HEARTBEAT_TIMEOUT_SECONDS = 10
+
+_REGISTER_WORKER_SQL = """
+    INSERT OR REPLACE INTO workers (pid, worker_id, started_at, last_heartbeat)
+    VALUES (?, ?, ?, ?)
+"""
+
+# An upsert rather than a plain UPDATE: if the heartbeat stalled long enough for
+# another worker's register_worker to prune this row, the next beat restores it.
+_HEARTBEAT_SQL = """
+    INSERT INTO workers (pid, worker_id, started_at, last_heartbeat)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(pid) DO UPDATE SET last_heartbeat = excluded.last_heartbeat
+"""
+
+_ACTIVE_WORKERS_SQL = "SELECT pid FROM workers WHERE last_heartbeat > ?"
+
+def register_worker(worker_id):
+    """
+    Records this process in the workers table, pruning rows left by dead workers.
+    Returns the recorded start time, which heartbeat_loop needs to restore the row.
+    """
+    now = datetime.now(_UTC)
+    now_iso = now.isoformat(timespec='microseconds')
+    cutoff_iso = (now - timedelta(seconds=HEARTBEAT_TIMEOUT_SECONDS)).isoformat(timespec='microseconds')
+    with get_db_connection() as conn:
+        conn.execute(WORKERS_SCHEMA_SQL)
+        conn.execute("DELETE FROM workers WHERE last_heartbeat <= ?", (cutoff_iso,))
+        conn.execute(_REGISTER_WORKER_SQL, (os.getpid(), worker_id, now_iso, now_iso))
+    return now_iso
+
+def unregister_worker():
+    """Removes this process from the workers table."""
+    with get_db_connection() as conn:
+        conn.execute("DELETE FROM workers WHERE pid = ?", (os.getpid(),))
+
+def heartbeat_loop(stop_event, worker_id, started_at):
+    """Refreshes this worker's heartbeat until `stop_event` is set, including while a long job runs."""
+    pid = os.getpid()
+    while not stop_event.wait(HEARTBEAT_INTERVAL_SECONDS):
+        try:
+            with get_db_connection() as conn:
+                now_iso = datetime.now(_UTC).isoformat(timespec='microseconds')
+                conn.execute(_HEARTBEAT_SQL, (pid, worker_id, started_at, now_iso))
+        except sqlite3.Error as e:
+            print(f"Worker (PID: {pid}) failed to record heartbeat: {e}")
+
+def get_active_worker_pids():
+    """Returns the PIDs of workers whose heartbeat is recent enough to be alive."""
+    cutoff = datetime.now(_UTC) - timedelta(seconds=HEARTBEAT_TIMEOUT_SECONDS)
+    try:
+        with get_db_connection() as conn:
+            rows = conn.execute(_ACTIVE_WORKERS_SQL, (cutoff.isoformat(timespec='microseconds'),))
+            return [row['pid'] for row in rows]
+    except sqlite3.OperationalError as e:
+        # No worker has registered against this database yet (e.g. before init-db).
+        if "no such table" in str(e):
+            return []
+        raise
\ No newline at end of file
@@ -8,6 +8,8 @@ setup(
     include_package_data=True,
     install_requires=[
         'click',
+        'orjson',
+        'msgspec',
     ],
     entry_points={
         'console_scripts': [
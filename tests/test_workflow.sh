@@ -4,10 +4,10 @@ echo "--- QueueCTL Test Workflow ---"
 set -e 
 
 echo "🧹 Cleaning up old database and workers..."
-rm -f ~/.queuectl/queue.db
-rm -f ~/.queuectl/workers/*.pid
 queuectl worker stop > /dev/null 2>&1 || true
 sleep 1
+rm -f ~/.queuectl/queue.db ~/.queuectl/queue.db-wal ~/.queuectl/queue.db-shm
+rm -f ~/.queuectl/notify/*.sock
 
 echo "📦 Installing and initializing database..."
 pip install . > /dev/null
@@ -25,6 +25,26 @@ queuectl enqueue '{"id":"job-success","command":"echo Hello from job-success"}'
 queuectl enqueue '{"id":"job-fail-once","command":"(exit 1)"}'
 queuectl enqueue '{"id":"job-invalid","command":"thiscommanddoesnotexist"}'
 
+echo "📦 Enqueuing a batch..."
+BATCH_FILE=$(mktemp)
+echo '[{"id":"batch-1","command":"echo Hello from batch-1"},{"id":"batch-2","command":"echo Hello from batch-2"}]' > "$BATCH_FILE"
+queuectl enqueue-batch "$BATCH_FILE"
+
+echo "📦 Enqueuing a batch with a duplicate ID..."
+echo '[{"id":"batch-new","command":"echo never runs"},{"id":"job-success","command":"echo duplicate"}]' > "$BATCH_FILE"
+BATCH_OUTPUT=$(queuectl enqueue-batch "$BATCH_FILE")
+rm -f "$BATCH_FILE"
+echo "$BATCH_OUTPUT"
+if [[ ! "$BATCH_OUTPUT" == *"No jobs were enqueued"* ]]; then
+    echo "❌ TEST FAILED: duplicate ID in batch was not rejected."
+    exit 1
+fi
+if [[ "$(queuectl list)" == *"batch-new"* ]]; then
+    echo "❌ TEST FAILED: 'batch-new' was enqueued despite the batch being rejected."
+    exit 1
+fi
+echo "✔ Batch with a duplicate ID was rolled back as a whole."
+
 echo "⏳ Waiting 10 seconds for jobs to process and retry..."
 sleep 10
 
@@ -41,6 +61,30 @@ if [[ ! "$COMPLETED_JOBS" == *"job-success"* ]]; then
     exit 1
 fi
 echo "✔ 'job-success' completed as expected."
+for BATCH_JOB in batch-1 batch-2; do
+    if [[ ! "$COMPLETED_JOBS" == *"$BATCH_JOB"* ]]; then
+        echo "❌ TEST FAILED: '$BATCH_JOB' not found in completed jobs."
+        exit 1
+    fi
+done
+echo "✔ Batch jobs completed as expected."
+
+echo "✅ Validating --limit/--offset paging..."
+FIRST_PAGE=$(queuectl list --state completed --limit 1)
+if [[ ! "$FIRST_PAGE" == *"job-success"* ]] || [[ $(grep -c '"id"' <<< "$FIRST_PAGE") -ne 1 ]]; then
+    echo "❌ TEST FAILED: '--limit 1' did not return just the oldest completed job."
+    exit 1
+fi
+SECOND_PAGE=$(queuectl list --state completed --limit 1 --offset 1)
+if [[ "$SECOND_PAGE" == *"job-success"* ]] || [[ $(grep -c '"id"' <<< "$SECOND_PAGE") -ne 1 ]]; then
+    echo "❌ TEST FAILED: '--limit 1 --offset 1' did not return just the next completed job."
+    exit 1
+fi
+if [[ ! "$SECOND_PAGE" == *"showing 1 of 3"* ]]; then
+    echo "❌ TEST FAILED: paged listing header does not report 'showing 1 of 3'."
+    exit 1
+fi
+echo "✔ Paging returned one job per page as expected."
 
 echo "---"
 